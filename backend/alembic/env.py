@@ -1,11 +1,12 @@
 from __future__ import annotations
+from functools import lru_cache
 from logging.config import fileConfig
 from alembic import context
 from sqlalchemy import pool
 from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
-from app.core.config import settings
+from app.core.config import async_database_url, get_settings
 from app.db.base import Base
 from app.models import *  # noqa: F401
 
@@ -17,9 +18,11 @@ if config.config_file_name is not None:
 # Métadonnées des modèles (tables)
 target_metadata = Base.metadata
 
+@lru_cache(maxsize=1)
 def get_url() -> str:
-    # Récupère l'URL de la base depuis .env via pydantic-settings
-    return settings.DATABASE_URL
+    # Récupère l'URL de la base depuis .env via pydantic-settings, avec le driver asyncpg
+    # comme pour l'application (une URL 'postgresql://' suffit)
+    return async_database_url(get_settings().DATABASE_URL)
 
 def run_migrations_offline() -> None:
     # Mode "offline" : exécute les migrations sans connexion live (génère du SQL)
@@ -54,6 +57,14 @@ def run_migrations() -> None:
     # Choisit online/offline selon le mode
     if context.is_offline_mode():
         run_migrations_offline()
+        return
+
+    # Connexion fournie par l'appelant via cfg.attributes["connection"] (ex: tests/CI qui lancent
+    # command.upgrade() dans conn.run_sync() avec le moteur de l'app):
+    # pas de nouveau moteur ni de nouvelle poignée de main TCP/TLS
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
     else:
         import asyncio
         asyncio.run(run_migrations_online())
@@ -1,7 +1,14 @@
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Nombre de workers uvicorn pour `python -m app.main` (même variable que le CLI uvicorn)
+    WEB_CONCURRENCY: int = 1
+    # Pool de connexions par processus (x WEB_CONCURRENCY au total côté PostgreSQL)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
 
     # pydantic v2: charge .env de façon fiable
     model_config = SettingsConfigDict(
@@ -11,4 +18,19 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Construit Settings une seule fois par processus (lecture env + .env).
+    Utilisable aussi comme dépendance FastAPI: Depends(get_settings).
+    """
+    return Settings()
+
+def async_database_url(url: str) -> str:
+    """
+    Force le driver asyncpg: une URL 'postgresql://' laisserait SQLAlchemy choisir psycopg.
+    Partagé par le moteur de l'application et par Alembic (alembic/env.py).
+    """
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
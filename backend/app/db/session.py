@@ -3,13 +3,21 @@ Crée le moteur async SQLAlchemy et la fabrique de sessions.
 Expose une dépendance FastAPI get_session() pour obtenir une AsyncSession par requête.
 """
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from app.core.config import settings
+from app.core.config import async_database_url, get_settings
+
 
 # Moteur de connexion asynchrone à PostgreSQL
+_settings = get_settings()
 engine = create_async_engine(
-    settings.DATABASE_URL,
+    async_database_url(_settings.DATABASE_URL),
     echo=False,   # passe à True en debug pour voir les requêtes SQL
-    future=True
+    future=True,
+    pool_size=_settings.DB_POOL_SIZE,
+    max_overflow=_settings.DB_MAX_OVERFLOW,
+    pool_recycle=1800,  # recycle les connexions après 30 min
+    query_cache_size=1200,  # cache SQLAlchemy des requêtes compilées (500 par défaut)
+    # asyncpg garde en cache les requêtes préparées (évite parse/plan à chaque appel)
+    connect_args={"prepared_statement_cache_size": 1024},
 )
 
 # Fabrique de sessions
@@ -4,21 +4,47 @@ Application FastAPI minimale avec deux endpoints:
 - /db-ping : vérifie la connexion à la base (SELECT 1)
 """
 #pour lancer le projet: py -m uvicorn app.main:app --reload
+#en production (uvloop + httptools si installés, WEB_CONCURRENCY workers): python -m app.main
 
 #fast API
 
-from fastapi import FastAPI, Depends,Request, Form
-from fastapi.responses import JSONResponse ,HTMLResponse
+from fastapi import FastAPI, Request, HTTPException
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+from contextlib import asynccontextmanager
 from pathlib import Path
+import gzip
+import hashlib
+import time
 
 
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_session
+from app.db.session import engine
 
-app = FastAPI(title="BibReaders API", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Démarrage: crée le dossier du cache bytecode Jinja puis compile les templates
+    maintenant plutôt qu'à la première requête sur chaque page.
+    Arrêt: ferme proprement les connexions du pool.
+    """
+    JINJA_CACHE_DIR.mkdir(exist_ok=True)
+    for name in PAGE_TEMPLATES:
+        templates.get_template(name)
+    yield
+    await engine.dispose()
+
+# orjson (C) sérialise le JSON plus vite que le module json standard et produit directement des bytes
+app = FastAPI(title="BibReaders API", version="0.1.0", default_response_class=ORJSONResponse,
+              lifespan=lifespan)
+
+# Compression gzip des réponses (CSS, JSON...) si le client l'accepte.
+# Les pages HTML en cache sont déjà compressées une fois pour toutes (voir render_page):
+# la middleware ne les recompresse pas puisqu'elles portent déjà Content-Encoding.
+app.add_middleware(GZipMiddleware, minimum_size=500)
 
 
 # Chemin vers le dossier frontend
@@ -30,35 +56,131 @@ app.mount("/static", StaticFiles(directory=BASE_DIR / "frontend" / "static"), na
 # Templates
 templates = Jinja2Templates(directory=BASE_DIR / "frontend" / "templates")
 
-#^^Page d'accueil
-@app.get("/", response_class=HTMLResponse)
-async def home(request: Request):
-    return templates.TemplateResponse("home.html", {"request": request})
-
-
-#^^ Page de connexion 
-@app.get("/login", response_class=HTMLResponse)
-async def login_get(request: Request):
-    return templates.TemplateResponse("login.html", {"request": request})
+# Cache du bytecode Jinja sur disque: les templates compilés survivent aux redémarrages
+# (le dossier est créé au démarrage, dans lifespan)
+JINJA_CACHE_DIR = BASE_DIR / "backend" / ".jinja_cache"
+templates.env.bytecode_cache = FileSystemBytecodeCache(str(JINJA_CACHE_DIR))
 
-#^^ Page de création de compte
-@app.get("/register", response_class=HTMLResponse)
-async def register_get(request: Request):
-    return templates.TemplateResponse("register.html", {"request": request})
+# Pages HTML: segment d'URL -> template ("" = page d'accueil)
+PAGES = {"": "home.html", "login": "login.html", "register": "register.html"}
+PAGE_TEMPLATES = tuple(PAGES.values())
 
+# Pages HTML rendues une fois puis servies depuis la mémoire.
+# Les templates n'utilisent que request.url_for, dont le résultat ne dépend que de l'URL de base:
+# clé = (template, base_url) -> (corps, corps gzip, ETag)
+PAGE_CACHE_MAX = 32
+_page_cache: dict[tuple[str, str], tuple[bytes, bytes, str]] = {}
 
+def accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Lit l'en-tête Accept-Encoding (jetons + q-values): vrai si gzip est accepté avec q > 0,
+    explicitement ou via '*'. 'gzip;q=0' refuse gzip; 'x-gzip-foo' ne compte pas.
+    """
+    star_q = None
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        coding = coding.lower()
+        if coding == "gzip":
+            return q > 0
+        if coding == "*":
+            star_q = q
+    return star_q is not None and star_q > 0
+
+def render_page(request: Request, name: str) -> Response:
+    """
+    Renvoie le HTML mis en cache pour ce template, avec ETag + Cache-Control.
+    La version gzip (compressée une seule fois) est servie si le client l'accepte.
+    Répond 304 si le navigateur possède déjà cette version (If-None-Match).
+    """
+    key = (name, str(request.base_url))
+    cached = _page_cache.get(key)
+    if cached is None:
+        body = templates.get_template(name).render({"request": request}).encode("utf-8")
+        digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+        cached = (body, gzip.compress(body, 9), digest)
+        if len(_page_cache) >= PAGE_CACHE_MAX:  # évite de grossir sans fin avec des Host arbitraires
+            _page_cache.clear()
+        _page_cache[key] = cached
+
+    body, gz_body, digest = cached
+    use_gzip = accepts_gzip(request.headers.get("accept-encoding", ""))
+    # un ETag par encodage: les deux variantes ne sont pas identiques octet pour octet
+    etag = f'"{digest}-gz"' if use_gzip else f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60, must-revalidate", "Vary": "Accept-Encoding"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return HTMLResponse(gz_body, headers=headers)
+    return HTMLResponse(body, headers=headers)
 
 @app.get("/health")
 async def health():
     """Retourne 'ok' si le serveur est vivant."""
-    return JSONResponse({"status": "ok"})
+    return {"status": "ok"}
+
+# Dernier SELECT 1 réussi (time.monotonic) : le monitoring appelle /db-ping souvent
+DB_PING_TTL = 5.0
+_last_db_ok = 0.0
+# Construite une seule fois: SQLAlchemy retrouve directement sa forme compilée en cache
+DB_PING_STMT = text("SELECT 1")
 
 @app.get("/db-ping")
-async def db_ping(session: AsyncSession = Depends(get_session)):
+async def db_ping():
     """
     Exécute SELECT 1 pour confirmer l'accès DB.
     Retourne {"db":1} si OK.
+    Le résultat est réutilisé pendant DB_PING_TTL secondes, et la requête passe
+    directement par une connexion du pool (pas de session ORM).
     """
-    result = await session.execute(text("SELECT 1"))
-    return {"db": result.scalar_one()}
-
+    global _last_db_ok
+    if time.monotonic() - _last_db_ok < DB_PING_TTL:
+        return {"db": 1}
+    async with engine.connect() as conn:
+        result = await conn.execute(DB_PING_STMT)
+        value = result.scalar_one()
+    _last_db_ok = time.monotonic()
+    return {"db": value}
+
+
+#^^ Pages HTML (accueil, connexion, création de compte): un seul handler.
+# Déclaré après les endpoints ci-dessus pour que /{page} ne masque pas /health ni /db-ping.
+# Dans les templates: url_for('home') et url_for('page', page='login').
+@app.get("/", response_class=HTMLResponse, name="home")
+@app.get("/{page}", response_class=HTMLResponse, name="page")
+async def page(request: Request, page: str = ""):
+    name = PAGES.get(page)
+    if name is None:
+        raise HTTPException(status_code=404)
+    return render_page(request, name)
+
+
+if __name__ == "__main__":
+    import uvicorn
+    from app.core.config import get_settings
+
+    try:
+        import uvloop  # boucle libuv, optionnelle (absente sous Windows)
+    except ImportError:
+        uvloop = None
+
+    try:
+        import httptools  # parseur HTTP en C, optionnel
+    except ImportError:
+        httptools = None
+
+    # Sans uvloop/httptools installés, on garde la boucle asyncio et le parseur par défaut
+    uvicorn.run(
+        "app.main:app",
+        loop="uvloop" if uvloop is not None else "asyncio",
+        http="httptools" if httptools is not None else "auto",
+        workers=get_settings().WEB_CONCURRENCY,
+    )
@@ -1,13 +1,15 @@
 """
 Modèle Livre = ressource du catalogue.
 Champs simples + rating entier 0..5, stock entier.
+(title, author) est unique: sert de clé de dédoublonnage au script de scraping.
 """
-from sqlalchemy import String, Integer, Float, Text
+from sqlalchemy import String, Integer, Float, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
 
 class Livre(Base):
     __tablename__ = "livres"
+    __table_args__ = (UniqueConstraint("title", "author", name="uq_livres_title_author"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
@@ -1,29 +1,55 @@
 """
-Scrape books.toscrape.com with Selenium, clean data, save to CSV,
+Scrape books.toscrape.com, clean data, save to CSV,
 and optionally insert into PostgreSQL using your FastAPI project's models.
 
 USAGE (run from backend/):
   python scripts/scrap_books_toscrape.py --csv data/livres_bruts.csv
   python scripts/scrap_books_toscrape.py --csv data/livres_bruts.csv --load-db
   python scripts/scrap_books_toscrape.py --csv data/livres_bruts.csv --no-desc
+  python scripts/scrap_books_toscrape.py --csv data/livres_bruts.csv --async
+  python scripts/scrap_books_toscrape.py --csv data/livres_bruts.csv --http-cache data/.http_cache
+  python scripts/scrap_books_toscrape.py --csv data/livres_bruts.csv --use-selenium
 
 Notes:
-- Selenium Manager (built into selenium>=4.10) auto-fetches the right ChromeDriver.
+- The site is fully static: listing and product pages are fetched over plain HTTP with one
+  keep-alive requests.Session and parsed in-process with lxml (no browser).
+- --async runs the same pipeline on one asyncio event loop with httpx: listing pages are
+  fetched concurrently and all descriptions of a page are in flight at once (bounded by
+  --desc-workers) without one thread per request, multiplexed over HTTP/2 when
+  httpx[http2] is installed.
+- --http-cache keeps each product page's ETag/Last-Modified and description on disk: re-runs
+  send conditional GETs and unchanged pages come back as empty 304s. With --http-cache-ttl,
+  recent entries are reused without any request at all.
+- --use-selenium drives Chrome for the listing pages instead (fallback only); add
+  --chrome-debugger 127.0.0.1:9222 to reuse a long-lived Chrome across runs.
+  Selenium Manager (built into selenium>=4.10) auto-fetches the right ChromeDriver.
 - We keep dependencies minimal (standard csv module; no pandas).
-- If you pass --load-db, we insert into the 'livres' table using your app's async SQLAlchemy setup.
+- If you pass --load-db, we upsert into the 'livres' table using your app's async SQLAlchemy setup
+  (new books are inserted; --update-existing also refreshes price/stock/rating/image of known ones).
+  Add --copy for a first load: rows are streamed with COPY while the table is still empty.
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
 import csv
 import os
 import re
+import shelve
 import sys
+import threading
 import time
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterator, List, NamedTuple, Optional, TextIO, Tuple
 from urllib.parse import urljoin
 
+import lxml.html
+from lxml import etree
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 # ------------------ Make the project 'app' importable when run from backend/ ---
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))          # .../backend/scripts
 BACKEND_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, ".."))   # .../backend
@@ -32,44 +58,64 @@ if BACKEND_ROOT not in sys.path:
 
 # ------------------ Optional DB imports (used only when --load-db) -------------
 try:
-    import asyncio
-    from sqlalchemy import select
-    from sqlalchemy.ext.asyncio import AsyncSession
-    from app.db.session import SessionLocal
+    from sqlalchemy import func, select
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+    from app.db.session import SessionLocal, engine
     from app.models.livre import Livre
 except Exception:
     # DB is optional; we'll handle None checks later
     Livre = None
     SessionLocal = None
+    engine = None
+
+# ------------------ Optional async HTTP client (used only when --async) --------
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
-# ------------------ Selenium imports ------------------------------------------
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+# HTTP/2 needs the optional 'h2' package (pip install "httpx[http2]"); HTTP/1.1 otherwise
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# ------------------ Optional Selenium imports (used only when --use-selenium) --
+try:
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+except ImportError:
+    webdriver = None
 
 
-BASE_URL = "http://books.toscrape.com/"
+BASE_URL = "https://books.toscrape.com/"  # TLS: lets httpx negotiate HTTP/2 (ALPN)
 CATALOGUE_URL = urljoin(BASE_URL, "catalogue/")
 START_PAGE = urljoin(CATALOGUE_URL, "page-1.html")
 
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; BibReaders-scraper/1.0)",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
 
 # ============================== Helpers (parsing) ==============================
 
-def rating_text_to_int(rating_text: str) -> int:
-    """
-    Convert star rating text ('Zero','One','Two','Three','Four','Five') -> int 0..5.
-    """
-    mapping = {"Zero": 0, "One": 1, "Two": 2, "Three": 3, "Four": 4, "Five": 5}
-    return mapping.get((rating_text or "").strip(), 0)
+# Built once at import: these helpers run for every scraped row
+_RATING_MAP = {"Zero": 0, "One": 1, "Two": 2, "Three": 3, "Four": 4, "Five": 5}
+_PRICE_RE = re.compile(r"(\d+(?:\.\d+)?)")
+_INT_RE = re.compile(r"(\d+)")
 
 
 def parse_price(price_text: str) -> float:
     """
     Price text looks like '£51.77'. Extract the float (51.77).
     """
-    match = re.search(r"(\d+(?:\.\d+)?)", price_text or "")
+    match = _PRICE_RE.search(price_text or "")
     return float(match.group(1)) if match else 0.0
 
 
@@ -78,91 +124,288 @@ def parse_availability(avail_text: str) -> int:
     Availability often like: 'In stock (19 available)' or 'In stock'.
     Extract the first integer found, else 0 if not found.
     """
-    match = re.search(r"(\d+)", avail_text or "")
+    match = _INT_RE.search(avail_text or "")
     return int(match.group(1)) if match else 0
 
 
-def clean_row(raw: Dict[str, str]) -> Dict[str, object]:
+class CleanRow(NamedTuple):
     """
-    Convert raw scraped strings into clean, typed fields for CSV/DB.
+    One cleaned book, fields in CSV column order (a plain tuple: cheap to build, and
+    csv.writer can write it as is).
     """
-    return {
-        "title": (raw.get("title") or "").strip() or "Untitled",
-        "author": (raw.get("author") or "Unknown").strip() or "Unknown",
-        "description": (raw.get("description") or "").strip(),
-        "price": parse_price(raw.get("price_text", "")),
-        "stock": parse_availability(raw.get("availability_text", "")),
-        "rating": rating_text_to_int(raw.get("rating_text", "")),
-        "image_url": (raw.get("image_url") or "").strip(),
-        "product_url": (raw.get("product_url") or "").strip(),
-    }
+    title: str
+    author: str
+    description: str
+    price: float
+    stock: int
+    rating: int
+    image_url: str
+    product_url: str
 
 
 # ========================= Product-page description ===========================
 
-def get_full_description_newtab(driver: webdriver.Chrome, product_url: str, timeout: int = 10) -> str:
+def build_http_session() -> requests.Session:
+    """
+    One pooled, keep-alive session for every product page: the TCP connection to the
+    site is reused instead of being re-opened for each of the ~1000 descriptions.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,   # single host
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(HTTP_HEADERS)
+    return session
+
+
+SESSION = build_http_session()
+
+
+_DESCRIPTION_XP = etree.XPath('string(//*[@id="product_description"]/following-sibling::p[1])')
+
+
+def parse_description(html: bytes) -> str:
     """
-    Open product_url in a NEW TAB, scrape description, then close and return to the listing tab.
-    Prevents losing the listing context and avoids stale element issues.
+    Extract the text of the <p> that follows #product_description ("" if missing).
+    lxml (C parser) is fed the raw bytes and picks the charset from the page's <meta>.
+    An empty or unparseable body also gives "" instead of aborting the scrape.
     """
-    original_window = driver.current_window_handle
     try:
-        # Open product in a new tab
-        driver.execute_script("window.open(arguments[0], '_blank');", product_url)
-        WebDriverWait(driver, timeout).until(EC.number_of_windows_to_be(2))
+        tree = lxml.html.fromstring(html)
+    except (etree.ParserError, ValueError):
+        return ""
+    return _DESCRIPTION_XP(tree).strip()
 
-        # Switch to the new tab (last handle)
-        driver.switch_to.window(driver.window_handles[-1])
 
-        # Wait for product page layout
-        WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "div.product_page"))
-        )
+# Optional on-disk cache of product pages: URL -> (ETag, Last-Modified, description, stored_at).
+# shelve is not thread-safe, hence the lock around every access (descriptions are fetched
+# from a thread pool).
+HTTP_CACHE: Optional[shelve.Shelf] = None
+HTTP_CACHE_TTL = 0.0  # seconds during which a cached page is reused without any request
+_HTTP_CACHE_LOCK = threading.Lock()
 
-        # The description is usually under #product_description followed by a <p>
-        hdr = driver.find_elements(By.ID, "product_description")
-        if not hdr:
-            return ""
-        p_tags = driver.find_elements(By.CSS_SELECTOR, "#product_description ~ p")
-        return p_tags[0].text.strip() if p_tags else ""
-    except Exception:
+CacheEntry = Tuple[str, str, str, float]
+
+
+def open_http_cache(path: str, ttl: float = 0.0) -> None:
+    """
+    Open (or create) the conditional-GET cache used by the description fetches.
+    Entries younger than `ttl` seconds are served from disk without touching the network;
+    older ones are revalidated with a conditional GET.
+    """
+    global HTTP_CACHE, HTTP_CACHE_TTL
+    HTTP_CACHE = shelve.open(path)
+    HTTP_CACHE_TTL = ttl
+
+
+def close_http_cache() -> None:
+    global HTTP_CACHE
+    if HTTP_CACHE is not None:
+        HTTP_CACHE.close()
+        HTTP_CACHE = None
+
+
+def _cached_entry(product_url: str) -> Optional[CacheEntry]:
+    if HTTP_CACHE is None:
+        return None
+    with _HTTP_CACHE_LOCK:
+        entry = HTTP_CACHE.get(product_url)
+    return entry if entry is not None and len(entry) == 4 else None  # other layouts: refetch
+
+
+def _is_fresh(entry: Optional[CacheEntry]) -> bool:
+    return entry is not None and time.time() - entry[3] < HTTP_CACHE_TTL
+
+
+def _conditional_headers(entry: Optional[CacheEntry]) -> Dict[str, str]:
+    """
+    Validators of a cached page, so the server can answer 304 Not Modified (empty body).
+    """
+    if entry is None:
+        return {}
+    etag, last_modified = entry[0], entry[1]
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def _remember(product_url: str, etag: str, last_modified: str, description: str) -> None:
+    if HTTP_CACHE is None:
+        return
+    if etag or last_modified or HTTP_CACHE_TTL > 0:
+        with _HTTP_CACHE_LOCK:
+            HTTP_CACHE[product_url] = (etag, last_modified, description, time.time())
+
+
+def _not_modified(product_url: str, entry: CacheEntry) -> str:
+    """
+    The server confirmed the cached page (304): restart its TTL and reuse its description.
+    """
+    if HTTP_CACHE_TTL > 0:
+        _remember(product_url, entry[0], entry[1], entry[2])
+    return entry[2]
+
+
+def get_full_description_http(product_url: str, timeout: int = 10) -> str:
+    """
+    GET product_url through the shared SESSION and return the text of the <p> that
+    follows #product_description ("" if missing or on any HTTP error).
+    With HTTP_CACHE open, a fresh entry is returned as is; otherwise the request is
+    conditional and a 304 reuses the cached text.
+    """
+    entry = _cached_entry(product_url)
+    if _is_fresh(entry):
+        return entry[2]
+    try:
+        resp = SESSION.get(product_url, headers=_conditional_headers(entry), timeout=timeout)
+        if resp.status_code == 304 and entry is not None:
+            return _not_modified(product_url, entry)
+        resp.raise_for_status()
+    except requests.RequestException:
         return ""
-    finally:
-        # Close product tab and switch back
-        try:
-            if len(driver.window_handles) > 1:
-                driver.close()
-                driver.switch_to.window(original_window)
-        except Exception:
-            # Fallback: ensure we are on some valid window
-            handles = driver.window_handles
-            driver.switch_to.window(handles[0])
+
+    description = parse_description(resp.content)
+    _remember(product_url, resp.headers.get("ETag", ""), resp.headers.get("Last-Modified", ""), description)
+    return description
 
 
 # ============================== Scraping core =================================
 
-def build_driver() -> webdriver.Chrome:
+# Listing XPaths compiled once; the per-card ones return strings ("" when the node is missing)
+_CARDS_XP = etree.XPath('//ol[@class="row"]/li')
+_TITLE_XP = etree.XPath("string(.//h3/a/@title)")
+_HREF_XP = etree.XPath("string(.//h3/a/@href)")
+_PRICE_XP = etree.XPath('normalize-space(.//p[@class="price_color"])')
+_AVAIL_XP = etree.XPath('normalize-space(.//p[contains(@class, "availability")])')
+_RATING_XP = etree.XPath('string(.//p[contains(@class, "star-rating")]/@class)')
+_IMG_XP = etree.XPath("string(.//img/@src)")
+_NEXT_XP = etree.XPath('//li[@class="next"]/a/@href')
+
+
+def parse_listing_page(html: bytes, page_url: str) -> Tuple[List[CleanRow], Optional[str]]:
+    """
+    Extract the clean, typed card fields of one catalogue page and the absolute URL of the
+    next page (None on the last page). Pure in-process lxml work, no browser round-trips:
+    price, stock and rating are read straight from the nodes.
+    """
+    tree = lxml.html.fromstring(html)
+    rows: List[CleanRow] = []
+
+    for card in _CARDS_XP(tree):
+        title = _TITLE_XP(card).strip()
+        href = _HREF_XP(card)
+        price_text = _PRICE_XP(card)  # '£51.77'
+        avail_text = _AVAIL_XP(card)  # 'In stock' or 'In stock (19 available)'
+        rating_class = _RATING_XP(card)  # 'star-rating Three'
+        img_src = _IMG_XP(card)
+        if not (href and price_text and avail_text and rating_class and img_src):
+            # Skip any broken card; continue with the rest
+            continue
+
+        try:
+            price = float(price_text.lstrip("£"))
+        except ValueError:
+            price = parse_price(price_text)
+
+        rows.append(
+            CleanRow(
+                title=title or "Untitled",
+                author="Unknown",  # site doesn't expose author; keep Unknown
+                description="",  # filled later if fetch_descriptions
+                price=price,
+                stock=parse_availability(avail_text) if "(" in avail_text else 0,
+                rating=_RATING_MAP.get(rating_class.rpartition(" ")[2], 0),
+                image_url=urljoin(page_url, img_src),
+                product_url=urljoin(page_url, href),
+            )
+        )
+
+    next_href = _NEXT_XP(tree)
+    return rows, (urljoin(page_url, next_href[0]) if next_href else None)
+
+
+def iter_listing_pages_http(timeout: int = 10) -> Iterator[List[CleanRow]]:
+    """
+    Follow the catalogue pages with the shared SESSION and yield each page's clean rows.
+    """
+    page_url: Optional[str] = START_PAGE
+    page_idx = 1
+
+    while page_url:
+        resp = SESSION.get(page_url, timeout=timeout)
+        resp.raise_for_status()
+        page_rows, page_url = parse_listing_page(resp.content, page_url)
+        print(f"[Page {page_idx}] found {len(page_rows)} cards")
+        yield page_rows
+        page_idx += 1
+
+
+BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg",
+    "*.css", "*.woff*", "*.ttf",
+    "*googletag*", "*analytics*",
+]
+
+
+def build_driver(debugger_address: Optional[str] = None) -> webdriver.Chrome:
     """
     Build a Chrome WebDriver with reasonable defaults.
     - Headed (visible) by default to debug easily. Switch to headless if you want.
+    - With debugger_address ("127.0.0.1:9222"), attach to an already running Chrome
+      (started with --remote-debugging-port=9222 --user-data-dir=/tmp/chrome-scrape)
+      instead of paying the browser startup on every run.
     """
+    if webdriver is None:
+        raise RuntimeError("selenium is not installed; it is only needed for --use-selenium.")
+
     options = ChromeOptions()
-    # Uncomment for headless scraping:
-    # options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    return webdriver.Chrome(options=options)  # Selenium Manager handles chromedriver
+    # Return from driver.get() on DOMContentLoaded: only the DOM is read, never the subresources
+    options.page_load_strategy = "eager"
+    if debugger_address:
+        options.add_experimental_option("debuggerAddress", debugger_address)
+    else:
+        # Uncomment for headless scraping:
+        # options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+    driver = webdriver.Chrome(options=options)  # Selenium Manager handles chromedriver
+
+    # Don't download what the scraper never looks at (img[src] is read from the DOM)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    return driver
+
+
+# Runs in the page: returns every card's fields and the next-page URL as plain JSON.
+EXTRACT_PAGE_JS = """
+return {
+  cards: Array.from(document.querySelectorAll('ol.row li article.product_pod')).map(a => ({
+    title: a.querySelector('h3 a')?.title?.trim(),
+    url: a.querySelector('h3 a')?.href,
+    price: a.querySelector('.price_color')?.textContent,
+    avail: a.querySelector('.availability')?.textContent.trim(),
+    rating: a.querySelector('p.star-rating')?.className,
+    img: a.querySelector('img')?.src,
+  })),
+  next: document.querySelector('li.next a')?.href || null,
+};
+"""
 
 
-def scrape_all_books(fetch_descriptions: bool = True) -> List[Dict[str, str]]:
+def iter_listing_pages_selenium(debugger_address: Optional[str] = None) -> Iterator[List[CleanRow]]:
     """
-    Navigate all catalogue pages, extract card info (title, price, availability, rating, image),
-    and optionally open each product page for full description.
-    Returns a list of dicts (raw fields).
+    Fallback listing scraper: navigate the catalogue pages in Chrome and yield each page's clean rows.
+    An attached Chrome (debugger_address) is left running for the next invocation.
     """
-    rows: List[Dict[str, str]] = []
-    driver = build_driver()
+    driver = build_driver(debugger_address)
 
     try:
         page_url = START_PAGE
@@ -176,168 +419,533 @@ def scrape_all_books(fetch_descriptions: bool = True) -> List[Dict[str, str]]:
                 EC.presence_of_all_elements_located((By.CSS_SELECTOR, "ol.row li"))
             )
 
-            cards = driver.find_elements(By.CSS_SELECTOR, "ol.row li")
+            # One round-trip to Chrome for the whole page instead of ~6 find_element calls per card
+            data = driver.execute_script(EXTRACT_PAGE_JS)
+            cards = data["cards"]
             print(f"[Page {page_idx}] found {len(cards)} cards")
 
+            page_rows: List[CleanRow] = []
             for card in cards:
-                try:
-                    # Title & product link
-                    a = card.find_element(By.CSS_SELECTOR, "h3 a")
-                    title = a.get_attribute("title").strip()
-                    product_href = a.get_attribute("href")
-                    product_url = product_href if product_href.startswith("http") else urljoin(CATALOGUE_URL, product_href)
-
-                    # Price & availability
-                    price_text = card.find_element(By.CSS_SELECTOR, ".price_color").text
-                    avail_text = card.find_element(By.CSS_SELECTOR, ".availability").text
-
-                    # Rating from class "star-rating Three" etc.
-                    rating_el = card.find_element(By.CSS_SELECTOR, "p.star-rating")
-                    classes = rating_el.get_attribute("class").split()
-                    rating_text = [c for c in classes if c != "star-rating"][-1] if len(classes) > 1 else "Zero"
-
-                    # Image URL (absolute)
-                    img = card.find_element(By.CSS_SELECTOR, "img")
-                    img_src = img.get_attribute("src")
-                    image_url = img_src if img_src.startswith("http") else urljoin(BASE_URL, img_src)
-
-                    # Description via product page (optional)
-                    description = ""
-                    if fetch_descriptions:
-                        description = get_full_description_newtab(driver, product_url)
-
-                    rows.append(
-                        {
-                            "title": title,
-                            "author": "Unknown",  # site doesn't expose author; keep Unknown
-                            "price_text": price_text,
-                            "availability_text": avail_text,
-                            "rating_text": rating_text,
-                            "image_url": image_url,
-                            "description": description,
-                            "product_url": product_url,
-                        }
-                    )
+                # Skip any broken card; continue with the rest
+                if not (card.get("title") and card.get("url")):
+                    continue
 
-                    # Polite delay to reduce flakiness (adjust as you wish)
-                    time.sleep(0.05)
+                page_rows.append(
+                    CleanRow(
+                        title=card["title"],
+                        author="Unknown",  # site doesn't expose author; keep Unknown
+                        description="",  # filled later if fetch_descriptions
+                        price=parse_price(card.get("price") or ""),
+                        stock=parse_availability(card.get("avail") or ""),
+                        # Rating from class "star-rating Three" etc.: last token, no list built
+                        rating=_RATING_MAP.get((card.get("rating") or "").rpartition(" ")[2], 0),
+                        image_url=card.get("img") or "",  # DOM properties are already absolute
+                        product_url=card["url"],
+                    )
+                )
 
-                except Exception:
-                    # Skip any broken card; continue with the rest
-                    continue
+            yield page_rows
 
             # Next page?
-            next_links = driver.find_elements(By.CSS_SELECTOR, "li.next a")
-            if next_links:
-                next_href = next_links[0].get_attribute("href")
-                page_url = next_href if next_href.startswith("http") else urljoin(CATALOGUE_URL, next_href)
+            if data["next"]:
+                page_url = data["next"]
                 page_idx += 1
-                time.sleep(0.3)  # polite delay between pages
             else:
                 break
 
     finally:
-        driver.quit()
+        if debugger_address:
+            driver.service.stop()  # only our chromedriver; the shared browser stays up
+        else:
+            driver.quit()
+
 
-    return rows
+KnownDescriptions = Dict[Tuple[str, str], str]
+
+
+def apply_known_descriptions(
+    page_rows: List[CleanRow], known: Optional[KnownDescriptions]
+) -> Tuple[List[CleanRow], List[int]]:
+    """
+    Copy the descriptions already stored in DB into page_rows and return the indexes of the
+    rows whose product page still has to be fetched.
+    """
+    if not known:
+        return list(page_rows), list(range(len(page_rows)))
+    rows: List[CleanRow] = []
+    todo: List[int] = []
+    for i, r in enumerate(page_rows):
+        description = known.get((r.title, r.author))
+        if description:
+            rows.append(r._replace(description=description))
+        else:
+            rows.append(r)
+            todo.append(i)
+    return rows, todo
+
+
+def scrape_all_books_stream(
+    fetch_descriptions: bool = True,
+    desc_workers: int = 16,
+    use_selenium: bool = False,
+    chrome_debugger: Optional[str] = None,
+    known_descriptions: Optional[KnownDescriptions] = None,
+) -> Iterator[List[CleanRow]]:
+    """
+    Walk all catalogue pages (requests + lxml, or Chrome if use_selenium), extract card info
+    (title, price, availability, rating, image), and optionally fetch each product page for
+    full description. Descriptions of a page are fetched concurrently by `desc_workers`
+    threads sharing SESSION; Selenium, when used, stays on the main thread.
+    Books found in `known_descriptions` reuse that text and their page is not fetched.
+    Yields one list of CleanRow per catalogue page.
+    """
+    pages = iter_listing_pages_selenium(chrome_debugger) if use_selenium else iter_listing_pages_http()
+    executor = ThreadPoolExecutor(max_workers=desc_workers) if fetch_descriptions else None
+
+    try:
+        for page_rows in pages:
+            # Descriptions via product pages (optional): overlap the HTTP round-trips
+            if executor is not None:
+                page_rows, todo = apply_known_descriptions(page_rows, known_descriptions)
+                descriptions = executor.map(get_full_description_http, [page_rows[i].product_url for i in todo])
+                for i, description in zip(todo, descriptions):
+                    page_rows[i] = page_rows[i]._replace(description=description)
+            yield page_rows
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+# ============================== Async scraping ================================
+
+async def get_full_description_async(
+    client: "httpx.AsyncClient",
+    product_url: str,
+    sem: asyncio.Semaphore,
+    timeout: int = 10,
+    parse_executor: Optional[Executor] = None,
+) -> str:
+    """
+    Async twin of get_full_description_http: at most `sem` requests are in flight at once.
+    The lxml parse runs in `parse_executor` (a process pool spreads it over all cores; None is
+    the loop's default thread pool) so the event loop keeps serving the other requests.
+    """
+    entry = _cached_entry(product_url)
+    if _is_fresh(entry):
+        return entry[2]
+    async with sem:
+        try:
+            resp = await client.get(product_url, headers=_conditional_headers(entry), timeout=timeout)
+            if resp.status_code == 304 and entry is not None:
+                return _not_modified(product_url, entry)
+            resp.raise_for_status()
+        except httpx.HTTPError:
+            return ""
+    loop = asyncio.get_running_loop()
+    description = await loop.run_in_executor(parse_executor, parse_description, resp.content)
+    _remember(product_url, resp.headers.get("ETag", ""), resp.headers.get("Last-Modified", ""), description)
+    return description
+
+
+# "Page 1 of 50" in the pager of the first listing page
+_PAGE_COUNT_RE = re.compile(rb"Page\s+\d+\s+of\s+(\d+)")
+
+
+async def scrape_all_books_stream_async(
+    fetch_descriptions: bool = True,
+    concurrency: int = 32,
+    page_concurrency: int = 16,
+    parse_executor: Optional[Executor] = None,
+    known_descriptions: Optional[KnownDescriptions] = None,
+) -> AsyncIterator[List[CleanRow]]:
+    """
+    Same pages as scrape_all_books_stream(), on one event loop with one pooled keep-alive httpx
+    client. The first page gives the page count; every other listing page is then requested at
+    once (at most `page_concurrency` in flight) and each page's descriptions are fetched with
+    asyncio.gather (at most `concurrency` in flight). Pages are still yielded in order.
+    With h2 installed the client speaks HTTP/2, multiplexing those requests over one connection.
+    """
+    if httpx is None:
+        raise RuntimeError("httpx is not installed; it is only needed for --async.")
+
+    sem = asyncio.Semaphore(concurrency)
+    page_sem = asyncio.Semaphore(page_concurrency)
+    limits = httpx.Limits(
+        max_connections=concurrency,
+        max_keepalive_connections=concurrency,
+        keepalive_expiry=30,
+    )
+
+    async with httpx.AsyncClient(
+        headers=HTTP_HEADERS, limits=limits, http2=HTTP2_AVAILABLE, follow_redirects=True
+    ) as client:
+
+        async def add_descriptions(page_rows: List[CleanRow]) -> List[CleanRow]:
+            if not fetch_descriptions:
+                return page_rows
+            page_rows, todo = apply_known_descriptions(page_rows, known_descriptions)
+            descriptions = await asyncio.gather(
+                *(
+                    get_full_description_async(client, page_rows[i].product_url, sem, parse_executor=parse_executor)
+                    for i in todo
+                )
+            )
+            for i, description in zip(todo, descriptions):
+                page_rows[i] = page_rows[i]._replace(description=description)
+            return page_rows
+
+        async def load_page(page_url: str) -> Tuple[List[CleanRow], Optional[str]]:
+            async with page_sem:
+                resp = await client.get(page_url, timeout=10)
+                resp.raise_for_status()
+            page_rows, next_url = parse_listing_page(resp.content, page_url)
+            return await add_descriptions(page_rows), next_url
+
+        resp = await client.get(START_PAGE, timeout=10)
+        resp.raise_for_status()
+        page_rows, next_url = parse_listing_page(resp.content, START_PAGE)
+        match = _PAGE_COUNT_RE.search(resp.content)
+        tasks = [
+            asyncio.ensure_future(load_page(urljoin(START_PAGE, f"page-{n}.html")))
+            for n in range(2, int(match.group(1)) + 1)
+        ] if match else []
+
+        try:
+            print(f"[Page 1] found {len(page_rows)} cards")
+            yield await add_descriptions(page_rows)
+
+            for page_idx, task in enumerate(tasks, start=2):
+                page_rows, _ = await task
+                print(f"[Page {page_idx}] found {len(page_rows)} cards")
+                yield page_rows
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        # No page count in the pager: follow the "next" links one page at a time
+        page_idx = 2
+        while not tasks and next_url:
+            page_rows, next_url = await load_page(next_url)
+            print(f"[Page {page_idx}] found {len(page_rows)} cards")
+            yield page_rows
+            page_idx += 1
 
 
 # ============================== CSV saving ====================================
 
-def save_csv(rows: List[Dict[str, object]], csv_path: str) -> None:
+CSV_FIELDS = list(CleanRow._fields)
+
+
+def open_csv(csv_path: str) -> Tuple[TextIO, Any]:
     """
-    Save cleaned rows as CSV at csv_path.
+    Open csv_path once for the whole run and write the header.
+    Each scraped page is then appended with writer.writerows(rows); the 1 MiB
+    buffer is written out when full and on close (no per-page flush/fsync).
+    main_async() points this at a temporary file and only moves it over the real CSV once
+    the scrape succeeded, so a failed or interrupted run leaves the previous CSV untouched.
     """
-    os.makedirs(os.path.dirname(csv_path), exist_ok=True)
-    fieldnames = ["title", "author", "description", "price", "stock", "rating", "image_url", "product_url"]
-    with open(csv_path, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
+    os.makedirs(os.path.dirname(csv_path) or ".", exist_ok=True)
+    f = open(csv_path, "w", encoding="utf-8", newline="", buffering=1 << 20)
+    writer = csv.writer(f)
+    writer.writerow(CSV_FIELDS)
+    return f, writer
 
 
 # ============================== DB insertion ==================================
 
-async def _fetch_existing_title_author(session: AsyncSession) -> set[Tuple[str, str]]:
+# Livre columns filled by the scraper, in CleanRow order (CleanRow minus product_url)
+DB_COLUMNS = ["title", "author", "description", "price", "stock", "rating", "image_url"]
+
+UPSERT_CHUNK_ROWS = 1000  # 7 bind parameters per row: stays well under PostgreSQL's 32767 limit
+
+
+def build_upsert_stmt(rows: List[Dict[str, object]], update_existing: bool):
     """
-    Query existing (title, author) pairs to avoid duplicate inserts.
+    INSERT ... ON CONFLICT (title, author) for one chunk of rows (see upsert_books).
     """
-    result = await session.execute(select(Livre.title, Livre.author))
-    return set(result.all())
+    stmt = pg_insert(Livre).values(rows)
+    excluded = stmt.excluded
+    if update_existing:
+        return stmt.on_conflict_do_update(
+            index_elements=["title", "author"],
+            set_={
+                "price": excluded.price,
+                "stock": excluded.stock,
+                "rating": excluded.rating,
+                "image_url": excluded.image_url,
+                "description": func.coalesce(func.nullif(excluded.description, ""), Livre.description),
+            },
+        )
+    return stmt.on_conflict_do_update(
+        index_elements=["title", "author"],
+        set_={"description": excluded.description},
+        where=(Livre.description == "") & (excluded.description != ""),
+    )
+
+
+async def fetch_known_descriptions() -> KnownDescriptions:
+    """
+    (title, author) -> description of the books already described in DB. Without
+    --update-existing the upsert would not change those descriptions, so their product
+    pages are not fetched again (the CSV still gets the stored text).
+    """
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            select(Livre.title, Livre.author, Livre.description).where(Livre.description != "")
+        )
+        return {(title, author): description for title, author, description in result}
+
+
+def unique_books(clean_rows: List[CleanRow]) -> List[CleanRow]:
+    """
+    ON CONFLICT cannot touch the same row twice in one statement, and COPY would hit the
+    (title, author) unique constraint: keep the first occurrence of each pair.
+    """
+    rows_by_key: Dict[Tuple[str, str], CleanRow] = {}
+    for r in clean_rows:
+        rows_by_key.setdefault((r.title, r.author), r)
+    return list(rows_by_key.values())
 
 
-async def bulk_insert_books(clean_rows: List[Dict[str, object]]) -> int:
+async def copy_books(clean_rows: List[CleanRow]) -> Optional[int]:
     """
-    Insert books into the 'livres' table (async).
-    - Skips simple duplicates based on (title, author).
-    Returns number of inserted rows.
+    First-load fast path: stream the rows into an EMPTY 'livres' table with PostgreSQL COPY
+    (asyncpg copy_records_to_table, binary protocol) instead of INSERT statements.
+    Returns the number of copied rows, or None if the table already has rows (use upsert_books).
+    """
+    if Livre is None or engine is None:
+        print("DB models/session not available; skipping DB insertion.")
+        return 0
+
+    rows = unique_books(clean_rows)
+    async with engine.connect() as conn:
+        if (await conn.execute(select(Livre.id).limit(1))).first() is not None:
+            return None
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            Livre.__tablename__,
+            records=[r[:len(DB_COLUMNS)] for r in rows],
+            columns=DB_COLUMNS,
+        )
+        await conn.commit()
+
+    return len(rows)
+
+
+async def upsert_books(clean_rows: List[CleanRow], update_existing: bool = False) -> int:
+    """
+    Upsert books into the 'livres' table (async) with INSERT ... ON CONFLICT (title, author),
+    one statement and one commit per UPSERT_CHUNK_ROWS rows: short transactions, and a
+    failing batch is rolled back and reported while the other batches still land.
+    - New (title, author) pairs are inserted.
+    - Existing rows only get their description filled in if it was empty,
+      unless update_existing=True, which also refreshes price/stock/rating/image_url
+      (and replaces the description when a non-empty one was scraped).
+    PostgreSQL decides insert vs update server-side: no preload SELECT, no per-row Python diff.
+    Returns number of inserted or updated rows (0 is fine: nothing new to write);
+    raises only if every batch failed.
     """
     if Livre is None or SessionLocal is None:
         print("DB models/session not available; skipping DB insertion.")
         return 0
 
-    inserted = 0
-    async with SessionLocal() as session:  # reuse app's async session
-        existing = await _fetch_existing_title_author(session)
+    rows = [dict(zip(DB_COLUMNS, r)) for r in unique_books(clean_rows)]
+    if not rows:
+        return 0
 
-        for r in clean_rows:
-            key = (r["title"], r["author"])
-            if key in existing:
+    upserted = 0
+    ok_batches = 0
+    failed: List[str] = []
+    last_error: Optional[Exception] = None
+    async with SessionLocal() as session:  # reuse app's async session
+        for start in range(0, len(rows), UPSERT_CHUNK_ROWS):
+            batch = rows[start:start + UPSERT_CHUNK_ROWS]
+            try:
+                result = await session.execute(build_upsert_stmt(batch, update_existing))
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                print(f"  rows {start + 1}-{start + len(batch)} failed: {e}")
+                failed.append(f"{start + 1}-{start + len(batch)}")
+                last_error = e
                 continue
-            session.add(
-                Livre(
-                    title=r["title"],
-                    author=r["author"],
-                    description=r["description"],
-                    price=r["price"],
-                    stock=r["stock"],
-                    rating=r["rating"],
-                    image_url=r["image_url"],
-                )
-            )
-            inserted += 1
+            ok_batches += 1
+            upserted += result.rowcount
+            print(f"  {start + len(batch)}/{len(rows)} rows written")
 
-        await session.commit()
-
-    return inserted
+    if last_error is not None and ok_batches == 0:
+        raise last_error
+    if failed:
+        print(f"  {len(failed)} batch(es) not written (rows {', '.join(failed)})")
+    return upserted
 
 
 # ================================== CLI =======================================
 
+DB_FLUSH_ROWS = 10_000  # with --load-db, upsert every N scraped rows instead of all at the end
+
+
 def main():
     parser = argparse.ArgumentParser(description="Scrape books.toscrape.com and save to CSV (optionally load DB).")
     parser.add_argument("--csv", required=True, help="Output CSV path, e.g., data/livres_bruts.csv")
     parser.add_argument("--load-db", action="store_true", help="Also insert into PostgreSQL 'livres' table.")
+    parser.add_argument(
+        "--update-existing",
+        action="store_true",
+        help="With --load-db, also refresh price/stock/rating/image (and description) of books already in DB.",
+    )
+    parser.add_argument(
+        "--copy",
+        action="store_true",
+        help="With --load-db, bulk-load with COPY while 'livres' is empty (first load); upsert otherwise.",
+    )
     parser.add_argument(
         "--no-desc",
         action="store_true",
         help="Skip opening product pages for descriptions (faster).",
     )
+    parser.add_argument(
+        "--desc-workers",
+        type=int,
+        default=16,
+        help="Parallel product-description fetches: threads, or in-flight requests with --async (default: 16).",
+    )
+    parser.add_argument(
+        "--use-selenium",
+        action="store_true",
+        help="Drive Chrome for the listing pages instead of plain HTTP (slower fallback).",
+    )
+    parser.add_argument(
+        "--chrome-debugger",
+        metavar="HOST:PORT",
+        help="With --use-selenium, attach to a Chrome already started with --remote-debugging-port "
+             "(e.g. 127.0.0.1:9222) instead of launching a new one.",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Fetch pages with httpx on an asyncio event loop instead of threads.",
+    )
+    parser.add_argument(
+        "--parse-procs",
+        type=int,
+        default=0,
+        help="With --async, parse product pages in N worker processes (default: 0, a thread pool).",
+    )
+    parser.add_argument(
+        "--http-cache",
+        metavar="PATH",
+        help="On-disk cache of product pages (ETag/Last-Modified): re-runs only download changed pages.",
+    )
+    parser.add_argument(
+        "--http-cache-ttl",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="With --http-cache, reuse pages cached less than SECONDS ago without any request "
+             "(e.g. 86400 while iterating on the script; default: 0, always revalidate).",
+    )
     args = parser.parse_args()
+    if args.use_async and args.use_selenium:
+        parser.error("--async and --use-selenium cannot be combined.")
+    if args.parse_procs and not args.use_async:
+        parser.error("--parse-procs only applies with --async.")
+
+    # One event loop for the whole run: scraping (with --async) and the DB upserts share it,
+    # so the app's asyncpg pool is opened once and disposed once.
+    asyncio.run(main_async(args))
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    load_db = args.load_db
+    if load_db and (Livre is None or SessionLocal is None):
+        print("DB not available; cannot insert. Did you run this from backend/ with your project installed?")
+        load_db = False
+
+    if args.http_cache:
+        open_http_cache(args.http_cache, ttl=args.http_cache_ttl)
+
+    # CSV is written page by page as the scrape progresses; rows are only kept in memory
+    # when the DB load needs them, and are upserted every DB_FLUSH_ROWS rows.
+    clean_rows: List[CleanRow] = []
+    saved = 0
+    upserted = 0
+    csv_tmp = args.csv + ".tmp"
+    csv_file, writer = open_csv(csv_tmp)
+
+    async def flush_db() -> None:
+        nonlocal load_db, upserted
+        try:
+            written = await copy_books(clean_rows) if args.copy else None
+            if written is None:
+                written = await upsert_books(clean_rows, update_existing=args.update_existing)
+            upserted += written
+        except Exception as e:
+            print(f"DB insertion failed: {e}")
+            load_db = False  # keep scraping to CSV
+        clean_rows.clear()
+
+    async def save_page(page_rows: List[CleanRow]) -> None:
+        nonlocal saved
+        writer.writerows(page_rows)
+        saved += len(page_rows)
+        if load_db:
+            clean_rows.extend(page_rows)
+            if len(clean_rows) >= DB_FLUSH_ROWS:
+                await flush_db()
+
+    # Incremental run: books already described in DB keep their text, skip their product page
+    known_descriptions: Optional[KnownDescriptions] = None
+    if load_db and not args.update_existing and not args.no_desc:
+        try:
+            known_descriptions = await fetch_known_descriptions()
+            print(f"{len(known_descriptions)} books already described in DB: their pages are skipped.")
+        except Exception as e:
+            print(f"Could not read existing descriptions ({e}); fetching all product pages.")
 
-    print("Scraping list pages...")
-    raw_rows = scrape_all_books(fetch_descriptions=not args.no_desc)
-    print(f"Scraped {len(raw_rows)} raw rows.")
-
-    # Clean rows
-    clean_rows = [clean_row(r) for r in raw_rows]
-    print(f"Cleaned {len(clean_rows)} rows.")
-
-    # Save CSV
-    save_csv(clean_rows, args.csv)
-    print(f"Saved CSV to {args.csv}")
+    parse_executor = ProcessPoolExecutor(max_workers=args.parse_procs) if args.parse_procs > 0 else None
 
-    # Optional DB load
-    if args.load_db:
-        if Livre is None or SessionLocal is None:
-            print("DB not available; cannot insert. Did you run this from backend/ with your project installed?")
+    print("Scraping list pages...")
+    scraped = False
+    try:
+        if args.use_async:
+            async for page_rows in scrape_all_books_stream_async(
+                fetch_descriptions=not args.no_desc,
+                concurrency=args.desc_workers,
+                parse_executor=parse_executor,
+                known_descriptions=known_descriptions,
+            ):
+                await save_page(page_rows)
         else:
-            try:
-                inserted = asyncio.run(bulk_insert_books(clean_rows))
-                print(f"Inserted {inserted} rows into DB.")
-            except Exception as e:
-                print(f"DB insertion failed: {e}")
+            for page_rows in scrape_all_books_stream(
+                fetch_descriptions=not args.no_desc,
+                desc_workers=args.desc_workers,
+                use_selenium=args.use_selenium,
+                chrome_debugger=args.chrome_debugger,
+                known_descriptions=known_descriptions,
+            ):
+                await save_page(page_rows)
+        scraped = True
+    finally:
+        if parse_executor is not None:
+            parse_executor.shutdown()
+        SESSION.close()
+        close_http_cache()
+        csv_file.close()
+        if scraped:
+            os.replace(csv_tmp, args.csv)
+        else:
+            os.remove(csv_tmp)
+    print(f"Saved {saved} cleaned rows to CSV {args.csv}")
+
+    # Optional DB load (remaining rows)
+    if args.load_db and engine is not None:
+        if load_db and clean_rows:
+            await flush_db()
+        if load_db:
+            print(f"Inserted/updated {upserted} rows in DB.")
+        await engine.dispose()
 
 
 if __name__ == "__main__":
@@ -1,15 +1,29 @@
 import asyncio
 from sqlalchemy import text
-from app.core.config import settings
-from sqlalchemy.ext.asyncio import create_async_engine
+from app.db.session import engine
+
+try:
+    import uvloop  # boucle libuv, plus rapide pour les I/O asyncpg (absente sous Windows)
+except ImportError:
+    uvloop = None
 
 async def test_connection():
-    engine = create_async_engine(settings.DATABASE_URL)
+    # Même moteur (et même pool) que l'application: pas de second pool créé pour ce test
+    # Les trois sondes en une seule requête: un aller-retour réseau au lieu de trois
     try:
         async with engine.connect() as conn:
-            result = await conn.execute(text("SELECT 1"))
-            print("Connection successful:", result.scalar())
+            result = await conn.execute(text("SELECT 1, version(), current_database()"))
+            ok, version, database = result.one()
+            print("Connection successful:", ok)
+            print("Server:", version)
+            print("Database:", database)
     except Exception as e:
         print("Connection failed:", str(e))
+    finally:
+        # Ferme le pool dans la même boucle: sinon asyncpg signale des connexions non fermées
+        await engine.dispose()
 
-asyncio.run(test_connection())
\ No newline at end of file
+if uvloop is not None:
+    uvloop.run(test_connection())
+else:
+    asyncio.run(test_connection())
\ No newline at end of file